@@ -2,37 +2,185 @@
 AI models for iPump
 """
 
+import os
+import functools
+import operator
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def _physical_cores() -> int:
+    """Physical CPU cores, capped to avoid hyperthread oversubscription"""
+    cores = (psutil.cpu_count(logical=False) if psutil else None) or os.cpu_count() or 1
+    return min(cores, 16)
+
+# Size the OpenMP pool before numpy/xgboost load their runtimes
+N_JOBS = _physical_cores()
+os.environ.setdefault('OMP_NUM_THREADS', str(N_JOBS))
+
 import numpy as np
 import pandas as pd
 import joblib
 import json
-from sklearn.ensemble import RandomForestClassifier, IsolationForest, GradientBoostingClassifier
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.preprocessing import StandardScaler, RobustScaler
-from sklearn.metrics import classification_report, accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+from sklearn.ensemble import IsolationForest
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import RobustScaler
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from sklearn.impute import SimpleImputer
 import xgboost as xgb
-from datetime import datetime, timedelta
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run kernels as plain NumPy"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    import treelite
+    import tl2cgen
+except ImportError:
+    tl2cgen = None
+
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+from datetime import datetime
 import logging
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Union
 import warnings
 from pathlib import Path
-import sqlite3
-from contextlib import contextmanager
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from config import AI_MODELS_CONFIG, PUMP_CONFIG
 
 # Setup warnings
 warnings.filterwarnings('ignore')
 
+def _cuda_available() -> bool:
+    """Check whether XGBoost can train on a CUDA device"""
+    try:
+        if not xgb.build_info().get('USE_CUDA'):
+            return False
+        import cupy
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        # No CUDA build, no cupy or no visible device
+        return False
+
+_HAS_GPU = _cuda_available()
+
+# Model feature order, fixed for the lifetime of the process
+_FEATURES = tuple(AI_MODELS_CONFIG['failure_prediction']['features'])
+_FEATURE_INDEX = AI_MODELS_CONFIG['failure_prediction']['feature_index']
+_FEATURE_COUNT = AI_MODELS_CONFIG['failure_prediction']['feature_count']
+# Reads all model features from a reading in one C-level call
+_read_features = operator.itemgetter(*_FEATURES)
+
+def _feature_positions(*names: str) -> np.ndarray:
+    """Column positions of the given features in the model feature order"""
+    return np.array([_FEATURE_INDEX[name] for name in names], dtype=np.intp)
+
+def _combination_table(texts: np.ndarray, describe) -> np.ndarray:
+    """Precompute describe(selected texts) for every subset of texts, indexed by bitmask"""
+    table = np.empty(1 << len(texts), dtype=object)
+    for mask in range(len(table)):
+        table[mask] = describe([text for bit, text in enumerate(texts) if mask >> bit & 1])
+    return table
+
+def _bitmask(flags: np.ndarray) -> np.ndarray:
+    """Pack each row of boolean rule flags into an integer (column i -> bit i)"""
+    return flags @ (1 << np.arange(flags.shape[1]))
+
+@njit(cache=True)
+def _rule_bits_kernel(X: np.ndarray, columns: np.ndarray, limits: np.ndarray, signs: np.ndarray) -> np.ndarray:
+    """Threshold rule k sets bit k of each row's mask; all rules in a single pass"""
+    out = np.zeros(X.shape[0], dtype=np.int64)
+    for i in range(X.shape[0]):
+        for k in range(columns.shape[0]):
+            if X[i, columns[k]] * signs[k] > limits[k] * signs[k]:
+                out[i] |= 1 << k
+    return out
+
+@njit(cache=True)
+def _contribution_kernel(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Approximate feature contributions (value * importance * 10) rounded to 4 digits"""
+    out = np.empty_like(values)
+    np.around(values * weights * 10.0, 4, out)
+    return out
+
+@njit(cache=True)
+def _fill_gaps_kernel(X: np.ndarray) -> np.ndarray:
+    """In-place forward fill of each column in a single scan, back-filling the leading gap"""
+    for j in range(X.shape[1]):
+        last = np.nan
+        for i in range(X.shape[0]):
+            if not np.isnan(X[i, j]):
+                if np.isnan(last):
+                    X[:i, j] = X[i, j]
+                last = X[i, j]
+            else:
+                X[i, j] = last
+        if np.isnan(last):
+            X[:, j] = 0.0
+    return X
+
+def _stratified_split(y: np.ndarray, test_size: float, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Shuffled train/test row indices with each class split in the same proportion"""
+    rng = np.random.default_rng(seed)
+    train, test = [], []
+    for label in np.unique(y):
+        rows = rng.permutation(np.flatnonzero(y == label))
+        n_test = int(round(len(rows) * test_size))
+        test.append(rows[:n_test])
+        train.append(rows[n_test:])
+    return rng.permutation(np.concatenate(train)), rng.permutation(np.concatenate(test))
+
+def _fill_gaps(X: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column; leading NaNs take the first reading, empty columns 0"""
+    if _HAS_NUMBA:
+        return _fill_gaps_kernel(X)
+    if not X.size:
+        return X
+    # Loops are only fast compiled; otherwise index the last valid row per cell
+    columns = np.arange(X.shape[1])
+    rows = np.where(np.isnan(X), 0, np.arange(len(X))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    X = X[rows, columns]
+    leading = np.isnan(X)
+    first = np.nan_to_num(X[np.argmax(~leading, axis=0), columns])
+    return np.where(leading, first, X)
+
 class ModelManager:
     """Model manager for training and prediction operations"""
     
+    # One JSON record per line; the JSON list file is read only if no history exists yet
+    METADATA_PATH = Path('models/model_metadata.jsonl')
+    LEGACY_METADATA_PATH = Path('models/model_metadata.json')
+    # Serializes background appends with each other and with reads
+    _metadata_lock = threading.Lock()
+    # Recent records kept in memory; the file holds the full history
+    HISTORY_SIZE = 100
+    
     def __init__(self):
         self.logger = self._setup_logger()
-        self.model_history = []
+        self.model_history = deque(maxlen=self.HISTORY_SIZE)
     
-    def _setup_logger(self) -> logging.Logger:
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _setup_logger() -> logging.Logger:
         """Setup logging system"""
         logger = logging.getLogger(__name__)
         if not logger.handlers:
@@ -56,44 +204,126 @@ class ModelManager:
         }
         self.model_history.append(metadata)
         
-        # Save to file
-        metadata_path = Path('models/model_metadata.json')
-        metadata_path.parent.mkdir(exist_ok=True)
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(self.model_history, f, indent=4, ensure_ascii=False)
+        # Append to file off the training thread
+        record = json.dumps(metadata, ensure_ascii=False) + '\n'
+        threading.Thread(target=self._append_metadata, args=(record,), daemon=True).start()
+    
+    def _append_metadata(self, record: str):
+        """Append one serialized metadata record to the history file"""
+        try:
+            with self._metadata_lock:
+                self.METADATA_PATH.parent.mkdir(exist_ok=True)
+                with open(self.METADATA_PATH, 'a', encoding='utf-8') as f:
+                    f.write(record)
+        except OSError as e:
+            self.logger.error(f"❌ Error saving model metadata: {e}")
+    
+    def load_latest_metadata(self) -> Optional[Dict[str, Any]]:
+        """Load the most recent metadata record without reading the whole history"""
+        if self.METADATA_PATH.exists():
+            with self._metadata_lock, open(self.METADATA_PATH, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - 4096, 0))
+                lines = f.read().splitlines()
+            for line in reversed(lines):
+                if line.strip():
+                    return json.loads(line)
+        
+        if self.LEGACY_METADATA_PATH.exists():
+            with open(self.LEGACY_METADATA_PATH, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if metadata:
+                return metadata[-1]
+        return None
 
 class DataPreprocessor:
     """Data processor for cleaning and preparation"""
     
-    def __init__(self):
-        self.scaler = RobustScaler()  # More robust to outliers
-        self.imputer = SimpleImputer(strategy='median')
+    def __init__(self, scale: bool = True, impute: bool = True):
+        # Trees are invariant to rescaling, so tree models can skip the scaler
+        self.scaler = RobustScaler() if scale else None  # More robust to outliers
+        # XGBoost learns a default direction for NaN at every split
+        self.imputer = SimpleImputer(strategy='median') if impute else None
         self.feature_names = []
+        self._medians = None
+        self._center = None
+        self._scale = None
     
     def preprocess_features(self, df: pd.DataFrame, features: List[str], fit: bool = True) -> np.ndarray:
-        """Process features"""
+        """Process features; an ndarray must already hold the features in order"""
         try:
             # Select only required features
-            X = df[features].copy()
+            X = df[features].to_numpy(dtype=np.float32) if isinstance(df, pd.DataFrame) else df
             self.feature_names = features
             
             # Handle missing values
-            if fit:
+            if self.imputer is None:
+                X_imputed = X
+            elif fit:
                 X_imputed = self.imputer.fit_transform(X)
             else:
                 X_imputed = self.imputer.transform(X)
             
             # Normalize data
-            if fit:
+            if self.scaler is None:
+                X_scaled = X_imputed
+            elif fit:
                 X_scaled = self.scaler.fit_transform(X_imputed)
             else:
                 X_scaled = self.scaler.transform(X_imputed)
+            if fit:
+                self._cache_statistics()
             
-            return X_scaled
+            # XGBoost bins in float32; hand it contiguous float32 directly
+            return np.ascontiguousarray(X_scaled, dtype=np.float32)
             
         except Exception as e:
             raise Exception(f"Error in data processing: {e}")
     
+    def _cache_statistics(self):
+        """Keep fitted imputer/scaler statistics as NumPy arrays"""
+        self._medians = None if self.imputer is None else self.imputer.statistics_.astype(np.float32)
+        if self.scaler is None:
+            self._center = self._scale = None
+        else:
+            self._center = self.scaler.center_.astype(np.float32)
+            self._scale = self.scaler.scale_.astype(np.float32)
+    
+    def transform_row(self, values: np.ndarray) -> np.ndarray:
+        """Impute and scale raw feature values without pandas/sklearn overhead"""
+        # Preprocessors loaded from older pickles have no cached statistics
+        if not hasattr(self, '_medians'):
+            self._cache_statistics()
+        if self._medians is not None:
+            values = np.where(np.isnan(values), self._medians, values)
+        if self._center is None:
+            return values
+        return (values - self._center) / self._scale
+    
+    def save_statistics(self, path: Path):
+        """Save fitted statistics as raw NumPy arrays"""
+        if not hasattr(self, '_medians'):
+            self._cache_statistics()
+        statistics = {'features': np.array(self.feature_names)}
+        if self._medians is not None:
+            statistics['medians'] = self._medians
+        if self._center is not None:
+            statistics.update(center=self._center, scale=self._scale)
+        np.savez(path, **statistics)
+    
+    @classmethod
+    def load_statistics(cls, path: Path) -> 'DataPreprocessor':
+        """Restore a preprocessor for inference from saved statistics"""
+        with np.load(path) as stats:
+            scaled = 'center' in stats.files
+            imputed = 'medians' in stats.files
+            preprocessor = cls(scale=scaled, impute=imputed)
+            preprocessor._medians = stats['medians'] if imputed else None
+            preprocessor._center = stats['center'] if scaled else None
+            preprocessor._scale = stats['scale'] if scaled else None
+            preprocessor.feature_names = stats['features'].tolist()
+        return preprocessor
+    
     def get_feature_importance(self, model) -> Dict[str, float]:
         """Get feature importance"""
         try:
@@ -108,35 +338,129 @@ class DataPreprocessor:
 class AdvancedFailurePredictor:
     """Advanced pump failure prediction model"""
     
+    # Risk levels by adjusted probability breakpoints
+    _RISK_BREAKPOINTS = np.array([0.2, 0.4, 0.6, 0.8])
+    _RISK_LEVELS = np.array(["Normal", "Low", "Medium", "High", "Critical"], dtype=object)
+    _RISK_COLORS = np.array(["#198754", "#20c997", "#ffc107", "#fd7e14", "#dc3545"], dtype=object)
+    
+    # Critical factors raising the risk level
+    _CRITICAL_COLUMNS = _feature_positions('temperature', 'oil_level', 'vibration_x')
+    _CRITICAL_LIMITS = np.array([85, 0.2, 6.0])
+    _CRITICAL_SIGNS = np.array([1, -1, 1])
+    # Number of critical factors for every rule bitmask
+    _CRITICAL_COUNTS = np.array([bin(mask).count('1') for mask in range(1 << len(_CRITICAL_COLUMNS))])
+    
+    # Failure type rules; vibration/temperature limits depend on feature importance
+    _FAILURE_COLUMNS = _feature_positions(
+        'vibration_x', 'vibration_y', 'vibration_z', 'temperature',
+        'oil_level', 'oil_quality', 'bearing_temperature', 'flow_rate'
+    )
+    _FAILURE_FIXED_LIMITS = [0.3, 0.4, 85, 50]
+    _FAILURE_SIGNS = np.array([1, 1, 1, 1, -1, -1, 1, -1])
+    _FAILURE_LABELS = np.array([
+        "X-axis imbalance", "Y-axis imbalance", "Z-axis imbalance", "Overheating",
+        "Low oil level", "Oil contamination", "Bearing damage", "Low efficiency"
+    ], dtype=object)
+    _FAILURE_DESCRIPTIONS = _combination_table(
+        _FAILURE_LABELS, lambda labels: ", ".join(labels) or "No obvious failures"
+    )
+    
+    # Sensor rules: oil level, temperature, oil quality, then vibration on each axis
+    _RECOMMENDATION_COLUMNS = _feature_positions(
+        'oil_level', 'temperature', 'oil_quality', 'vibration_x', 'vibration_y', 'vibration_z'
+    )
+    _RECOMMENDATION_LIMITS = np.array([0.2, 90, 0.5, 4.0, 4.0, 4.0])
+    _RECOMMENDATION_SIGNS = np.array([-1, 1, -1, 1, 1, 1])
+    # Recommendation bits (texts 1, 2, 6 and 7) for every sensor rule bitmask
+    _SENSOR_RECOMMENDATION_BITS = np.array([
+        (mask & 0b011) << 1 | (mask & 0b100) << 4 | (mask >= 0b1000) << 7
+        for mask in range(1 << len(_RECOMMENDATION_COLUMNS))
+    ])
+    # Probability above 0.6 / 0.4 / 0.2 maps to maintenance within 24h / 3 days / a week
+    _MAINTENANCE_BREAKPOINTS = np.array([0.2, 0.4, 0.6])
+    _MAINTENANCE_TIERS = np.array([3, 2, 1])
+    # Recommendation bit (texts 3-5) of each maintenance tier, indexed by tier
+    _MAINTENANCE_BITS = np.zeros(len(_MAINTENANCE_BREAKPOINTS) + 1, dtype=np.int64)
+    _MAINTENANCE_BITS[_MAINTENANCE_TIERS] = 1 << np.arange(3, 6)
+    _RECOMMENDATION_TEXTS = np.array([
+        "Stop pump immediately and contact technical support",
+        "Urgent oil addition (level very low)",
+        "Urgent pump cooling",
+        "Schedule urgent maintenance within 24 hours",
+        "Schedule maintenance within 3 days",
+        "Preventive maintenance within a week",
+        "Replace oil at the earliest opportunity",
+        "Check balance and bearings"
+    ], dtype=object)
+    # Numbered recommendation list for every combination of matched rules
+    _RECOMMENDATION_LISTS = _combination_table(
+        _RECOMMENDATION_TEXTS,
+        lambda texts: [f"{priority}. {text}" for priority, text in enumerate(texts, 1)]
+        or ["Pump operating normally - continue periodic monitoring"]
+    )
+    
+    # Repeated readings (equal after rounding) reuse an earlier prediction
+    PREDICTION_CACHE_SIZE = 4096
+    PREDICTION_CACHE_DECIMALS = 2
+    
     def __init__(self):
         self.model_manager = ModelManager()
-        self.preprocessor = DataPreprocessor()
+        # Model file locations, resolved once
+        self._model_path = Path(AI_MODELS_CONFIG['failure_prediction']['model_path'])
+        # XGBoost's native UBJSON format
+        self._native_path = self._model_path.with_suffix('.ubj')
+        # Natively compiled trees next to the model file
+        self._library_path = self._model_path.with_suffix('.dll' if os.name == 'nt' else '.so')
+        self._preprocessor_path = self._model_path.parent / 'preprocessor.joblib'
+        self._statistics_path = self._model_path.parent / 'preprocessor.npz'
+        self.preprocessor = DataPreprocessor(scale=False, impute=False)
         self.model = None
+        self._booster = None
+        self._single_booster = None
+        self._compiled = None
+        # Input row reused by predict_failure, which runs on the GUI thread
+        self._row_buffer = np.empty((1, _FEATURE_COUNT), dtype=np.float32)
+        self._prediction_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.is_trained = False
         self.accuracy = 0.0
-        self.feature_importance = {}
+        self._set_feature_importance({})
         self.model_type = "XGBoost"
         self.load_model()
     
     def load_model(self):
         """Load pre-trained model"""
         try:
-            model_path = AI_MODELS_CONFIG['failure_prediction']['model_path']
-            preprocessor_path = model_path.parent / 'preprocessor.joblib'
-            
-            if model_path.exists() and preprocessor_path.exists():
-                self.model = joblib.load(model_path)
-                self.preprocessor = joblib.load(preprocessor_path)
+            model_found = self._native_path.exists() or self._model_path.exists()
+            statistics_found = self._statistics_path.exists() or self._preprocessor_path.exists()
+            if model_found and statistics_found:
+                if self._native_path.exists():
+                    # Native format keeps the trees; hyperparameters come from the constructor
+                    self.model = self._build_classifier()
+                    self.model.load_model(self._native_path)
+                else:
+                    # Older model directories only have the pickled classifier
+                    self.model = joblib.load(self._model_path)
+                if self._statistics_path.exists():
+                    self.preprocessor = DataPreprocessor.load_statistics(self._statistics_path)
+                else:
+                    # Older model directories only have the pickled preprocessor
+                    self.preprocessor = joblib.load(self._preprocessor_path)
+                    self.preprocessor.save_statistics(self._statistics_path)
+                if self.preprocessor._center is not None:
+                    # Older models were trained on scaled inputs
+                    self._fold_scaling_into_splits()
+                # Fixed for the model's lifetime; computed once here or in train_model
+                self._set_feature_importance(self.preprocessor.get_feature_importance(self.model))
+                self._cache_booster()
                 self.is_trained = True
                 self.model_manager.logger.info("✅ Loaded pre-trained model successfully")
                 
                 # Load model accuracy from metadata
-                metadata_path = Path('models/model_metadata.json')
-                if metadata_path.exists():
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                        if metadata:
-                            self.accuracy = metadata[-1].get('accuracy', 0.0)
+                metadata = self.model_manager.load_latest_metadata()
+                if metadata:
+                    self.accuracy = metadata.get('accuracy', 0.0)
             else:
                 self._initialize_new_model()
                 
@@ -144,18 +468,90 @@ class AdvancedFailurePredictor:
             self.model_manager.logger.error(f"❌ Error loading model: {e}")
             self._initialize_new_model()
     
-    def _initialize_new_model(self):
-        """Initialize new model"""
-        self.model = xgb.XGBClassifier(
+    def _cache_booster(self):
+        """Keep a handle on the native booster for inplace prediction"""
+        self._booster = self.model.get_booster()
+        if _HAS_GPU:
+            # Host arrays are scored on the CPU without a device round-trip
+            self._booster.set_param({'device': 'cpu'})
+        # Single readings are scored on one thread: OpenMP fork/join costs more than the tree walk
+        self._prediction_cache.clear()
+        self._single_booster = self._booster.copy()
+        self._single_booster.set_param({'nthread': 1})
+        
+        # Compiled trees are only trusted if built from the current model file
+        self._compiled = None
+        if tl2cgen is not None and self._library_path.exists() and self._native_path.exists() \
+                and self._library_path.stat().st_mtime >= self._native_path.stat().st_mtime:
+            try:
+                self._compiled = tl2cgen.Predictor(str(self._library_path), nthread=1)
+            except Exception as e:
+                self.model_manager.logger.warning(f"⚠️ Cannot load compiled model: {e}")
+    
+    def _fold_scaling_into_splits(self):
+        """Rewrite split thresholds into raw units so inference can skip the scaler"""
+        center = self.preprocessor._center.astype(np.float32)
+        scale = self.preprocessor._scale.astype(np.float32)
+        booster = self.model.get_booster()
+        dump = json.loads(booster.save_raw('json'))
+        for tree in dump['learner']['gradient_booster']['model']['trees']:
+            conditions = np.array(tree['split_conditions'], dtype=np.float32)
+            features = np.array(tree['split_indices'])
+            splits = np.flatnonzero(np.array(tree['left_children']) != -1)
+            c, s = center[features[splits]], scale[features[splits]]
+            # (x - c) / s < t  <=>  x < t * s + c, as s > 0
+            t = conditions[splits]
+            raw = (t.astype(np.float64) * s + c).astype(np.float32)
+            # Step to the first float32 the original float32 scaling sends right of t,
+            # so readings on a bin boundary keep their branch
+            while True:
+                low = (raw - c) / s < t
+                high = (np.nextafter(raw, -np.inf) - c) / s >= t
+                if not (low.any() or high.any()):
+                    break
+                raw[low] = np.nextafter(raw[low], np.inf)
+                raw[high] = np.nextafter(raw[high], -np.inf)
+            conditions[splits] = raw
+            tree['split_conditions'] = conditions.tolist()
+        booster.load_model(bytearray(json.dumps(dump), 'utf-8'))
+        self.preprocessor.scaler = None
+        self.preprocessor._center = self.preprocessor._scale = None
+    
+    def _compile_model(self):
+        """Compile the trained trees to a shared library for single-reading inference"""
+        if tl2cgen is None:
+            return
+        try:
+            tl2cgen.export_lib(
+                treelite.frontend.from_xgboost(self.model.get_booster()),
+                toolchain='msvc' if os.name == 'nt' else 'gcc',
+                libpath=str(self._library_path),
+                params={'parallel_comp': 0}
+            )
+            self.model_manager.logger.info("⚙️ Compiled model to native code")
+        except Exception as e:
+            self.model_manager.logger.warning(f"⚠️ Cannot compile model, using XGBoost inference: {e}")
+    
+    @staticmethod
+    def _build_classifier() -> xgb.XGBClassifier:
+        """Untrained classifier with the model hyperparameters"""
+        return xgb.XGBClassifier(
             n_estimators=200,
             max_depth=8,
             learning_rate=0.05,
             subsample=0.8,
             colsample_bytree=0.8,
+            tree_method='hist',  # Histogram split finding
+            device='cuda' if _HAS_GPU else 'cpu',
+            n_jobs=N_JOBS,
             random_state=42,
             eval_metric='logloss'
         )
-        self.model_manager.logger.info("🆕 Created new model")
+    
+    def _initialize_new_model(self):
+        """Initialize new model"""
+        self.model = self._build_classifier()
+        self.model_manager.logger.info(f"🆕 Created new model ({'GPU' if _HAS_GPU else 'CPU'})")
     
     def load_training_data(self) -> pd.DataFrame:
         """
@@ -163,8 +559,11 @@ class AdvancedFailurePredictor:
         This function replaces the dummy data generation.
         """
         training_file = AI_MODELS_CONFIG['failure_prediction'].get('training_data_file')
+        # Only the model columns, parsed straight to compact dtypes
+        dtypes = {feature: np.float32 for feature in _FEATURES}
+        dtypes['failure'] = np.int8
         try:
-            df = pd.read_csv(training_file)
+            df = pd.read_csv(training_file, engine=_CSV_ENGINE, dtype=dtypes, usecols=list(dtypes))
             self.model_manager.logger.info(f"✅ Loaded training data from {training_file}")
             return df
         except Exception as e:
@@ -183,29 +582,32 @@ class AdvancedFailurePredictor:
                 return {}
             
             # Split data
-            features = AI_MODELS_CONFIG['failure_prediction']['features']
-            X = training_data[features]
-            y = training_data['failure']
+            features = list(_FEATURES)
+            X = training_data[features].to_numpy(dtype=np.float32)
+            y = training_data['failure'].to_numpy(dtype=np.int8)
             
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
+            train_index, test_index = _stratified_split(y, test_size=0.2, seed=42)
+            X_train, X_test = X[train_index], X[test_index]
+            y_train, y_test = y[train_index], y[test_index]
             
-            # Process data
-            X_train_processed = self.preprocessor.preprocess_features(X_train, features, fit=True)
-            X_test_processed = self.preprocessor.preprocess_features(X_test, features, fit=False)
+            # Process data; the fitted preprocessor replaces the current one with the new model
+            preprocessor = DataPreprocessor(scale=False, impute=False)
+            X_train_processed = preprocessor.preprocess_features(X_train, features, fit=True)
+            X_test_processed = preprocessor.preprocess_features(X_test, features, fit=False)
             
             if use_cross_validation:
                 # Cross-validation
-                cv_scores = cross_val_score(self.model, X_train_processed, y_train, cv=5, scoring='accuracy')
+                cv_scores = self._with_cpu_fallback(
+                    lambda: self._cross_validate(X_train_processed, y_train, folds=5)
+                )
                 self.model_manager.logger.info(f"📊 Cross-validation accuracy: {cv_scores.mean():.4f} (±{cv_scores.std():.4f})")
             
             # Train model
-            self.model.fit(X_train_processed, y_train)
+            self._with_cpu_fallback(lambda: self.model.fit(X_train_processed, y_train))
             
-            # Evaluate model
-            y_pred = self.model.predict(X_test_processed)
+            # Evaluate model; one pass over the trees gives both probabilities and labels
             y_pred_proba = self.model.predict_proba(X_test_processed)[:, 1]
+            y_pred = (y_pred_proba > 0.5).astype(np.int8)
             
             # Calculate multiple metrics
             self.accuracy = accuracy_score(y_test, y_pred)
@@ -219,18 +621,21 @@ class AdvancedFailurePredictor:
             self.model_manager.logger.info(f"🎯 F1-Score: {f1:.4f}")
             
             # Get feature importance
-            self.feature_importance = self.preprocessor.get_feature_importance(self.model)
+            self._set_feature_importance(preprocessor.get_feature_importance(self.model))
             
             # Save model and preprocessor
-            model_path = AI_MODELS_CONFIG['failure_prediction']['model_path']
-            model_path.parent.mkdir(parents=True, exist_ok=True)
+            self._model_path.parent.mkdir(parents=True, exist_ok=True)
             
-            joblib.dump(self.model, model_path)
-            joblib.dump(self.preprocessor, model_path.parent / 'preprocessor.joblib')
+            self.model.save_model(self._native_path)
+            joblib.dump(preprocessor, self._preprocessor_path)
+            preprocessor.save_statistics(self._statistics_path)
+            self._compile_model()
             
             # Save metadata
             self.model_manager.save_model_metadata(self.model, self.accuracy, features)
             
+            self.preprocessor = preprocessor
+            self._cache_booster()
             self.is_trained = True
             self.model_manager.logger.info("💾 Model saved successfully")
             
@@ -247,6 +652,40 @@ class AdvancedFailurePredictor:
             self.model_manager.logger.error(f"❌ Error in model training: {e}")
             raise
     
+    def _with_cpu_fallback(self, train):
+        """Run a training step, retrying it on the CPU if the CUDA device fails"""
+        try:
+            return train()
+        except xgb.core.XGBoostError as e:
+            if self.model.get_params()['device'] == 'cpu':
+                raise
+            self.model_manager.logger.warning(f"⚠️ GPU training failed, retrying on CPU: {e}")
+            self.model.set_params(device='cpu')
+            return train()
+    
+    def _cross_validate(self, X: np.ndarray, labels: np.ndarray, folds: int = 5) -> np.ndarray:
+        """Stratified k-fold accuracy, slicing one DMatrix instead of rebuilding it per fold"""
+        params = {key: value for key, value in self.model.get_xgb_params().items() if value is not None}
+        rounds = self.model.get_num_boosting_rounds()
+        data = xgb.DMatrix(X, label=labels, nthread=N_JOBS)
+        splits = [
+            (data.slice(train_index), data.slice(test_index), labels[test_index])
+            for train_index, test_index in StratifiedKFold(n_splits=folds).split(X, labels)
+        ]
+        
+        # Folds are independent and training releases the GIL: run them side by side
+        # with the cores split between them. A GPU device trains one fold at a time.
+        workers = 1 if params.get('device', 'cpu') != 'cpu' else min(folds, N_JOBS)
+        params['n_jobs'] = max(1, N_JOBS // workers)
+        
+        def score(split):
+            train, test, expected = split
+            booster = xgb.train(params, train, num_boost_round=rounds)
+            return np.mean((booster.predict(test) > 0.5) == expected)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return np.array(list(executor.map(score, splits)))
+    
     def predict_failure(self, sensor_data: Dict[str, float]) -> Dict[str, Any]:
         """Predict failure probability with advanced error handling"""
         if not self.is_trained:
@@ -254,84 +693,200 @@ class AdvancedFailurePredictor:
             self.train_model()
         
         try:
-            # Check for missing data
-            missing_features = []
-            input_features = []
+            features = _FEATURES
             
-            for feature in AI_MODELS_CONFIG['failure_prediction']['features']:
-                value = sensor_data.get(feature)
-                if value is None:
-                    missing_features.append(feature)
-                    input_features.append(0)  # Default value
-                else:
-                    input_features.append(float(value))
+            # Fill the single input row in place; missing values stay NaN for the booster
+            X = self._row_buffer
+            row = X[0]
+            missing_features = []
+            try:
+                values = _read_features(sensor_data)
+            except KeyError:
+                values = None
+            if values is not None and None not in values:
+                row[:] = values
+            else:
+                for i, feature in enumerate(features):
+                    value = sensor_data.get(feature)
+                    if value is None:
+                        missing_features.append(feature)
+                        value = np.nan
+                    row[i] = value
             
             if missing_features:
                 self.model_manager.logger.warning(f"⚠️ Missing data: {missing_features}")
             
-            # Prepare data for prediction
-            input_df = pd.DataFrame([input_features], columns=AI_MODELS_CONFIG['failure_prediction']['features'])
-            input_processed = self.preprocessor.preprocess_features(input_df, AI_MODELS_CONFIG['failure_prediction']['features'], fit=False)
+            return self._predict_row(sensor_data)
+            
+        except Exception as e:
+            self.model_manager.logger.error(f"❌ Prediction error: {e}")
+            return self._get_error_response(str(e))
+    
+    def predict_failure_array(self, values: np.ndarray) -> Dict[str, Any]:
+        """Predict failure probability for one reading given in model feature order (NaN = missing)"""
+        if not self.is_trained:
+            self.model_manager.logger.warning("⚠️ Model not trained, auto-training...")
+            self.train_model()
+        
+        try:
+            self._row_buffer[0] = values
+            return self._predict_row()
+            
+        except Exception as e:
+            self.model_manager.logger.error(f"❌ Prediction error: {e}")
+            return self._get_error_response(str(e))
+    
+    def _predict_row(self, sensor_data: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Score the reading held in the input row buffer, reusing cached booster margins"""
+        X = self._row_buffer
+        row = X[0]
+        # Only the margin is cached: the rules, confidence and timing below read
+        # the exact reading, so nearby readings on either side of a threshold differ
+        key = np.round(row, self.PREDICTION_CACHE_DECIMALS).tobytes()
+        margins = self._prediction_cache.get(key)
+        if margins is not None:
+            self._prediction_cache.move_to_end(key)
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
             
-            # Prediction
-            failure_probability = self.model.predict_proba(input_processed)[0][1]
-            prediction = self.model.predict(input_processed)[0]
+            # Prepare data for prediction
+            input_processed = self.preprocessor.transform_row(X)
             
-            # Improve risk level determination
-            risk_level, risk_color = self._calculate_risk_level(failure_probability, sensor_data)
+            # Prediction on the compiled trees if available, else the native booster
+            if self._compiled is not None:
+                margins = self._compiled.predict(tl2cgen.DMatrix(input_processed), pred_margin=True).reshape(-1)
+            else:
+                margins = self._single_booster.inplace_predict(input_processed, predict_type='margin')
+            self._prediction_cache[key] = margins
+            if len(self._prediction_cache) > self.PREDICTION_CACHE_SIZE:
+                self._prediction_cache.popitem(last=False)
+        probabilities = 1.0 / (1.0 + np.exp(-margins))
+        
+        if sensor_data is None:
+            # Confidence and timing rules read the present values by name
+            sensor_data = {feature: value for feature, value in zip(_FEATURES, row.tolist()) if value == value}
+        return self._build_predictions([sensor_data], X, probabilities, margins > 0)[0]
+    
+    @staticmethod
+    def format_timestamp(timestamp_ns: int) -> datetime:
+        """Local datetime of a prediction's timestamp_ns, for display"""
+        return datetime.fromtimestamp(timestamp_ns / 1e9)
+    
+    def predict_failure_batch(self, sensor_data: Union[pd.DataFrame, List[Dict[str, float]]]
+                              ) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+        """Predict failure probability for many sensor readings at once"""
+        if not self.is_trained:
+            self.model_manager.logger.warning("⚠️ Model not trained, auto-training...")
+            self.train_model()
+        
+        if not isinstance(sensor_data, pd.DataFrame):
+            return self._predict_readings(list(sensor_data))
+        
+        try:
+            features = _FEATURES
             
-            # Determine failure type
-            failure_type = self._determine_failure_type(sensor_data)
+            missing_columns = [feature for feature in features if feature not in sensor_data.columns]
+            if missing_columns:
+                self.model_manager.logger.warning(f"⚠️ Missing data: {missing_columns}")
             
-            # Generate recommendations
-            recommendations = self._generate_recommendations(sensor_data, failure_probability, risk_level)
+            X = sensor_data.reindex(columns=features).to_numpy(dtype=np.float32)
+            results = self._predict_block(sensor_data.to_dict('records'), X)
+            return pd.DataFrame(results, index=sensor_data.index)
             
-            # Suggested maintenance timing
-            maintenance_timing = self._suggest_maintenance_timing(failure_probability, sensor_data)
+        except Exception as e:
+            self.model_manager.logger.error(f"❌ Batch prediction error: {e}")
+            return pd.DataFrame([self._get_error_response(str(e))] * len(sensor_data), index=sensor_data.index)
+    
+    def _predict_readings(self, rows: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """Score a list of reading dicts without building a DataFrame"""
+        try:
+            # None -> NaN
+            X = np.array([[sensor_data.get(feature) for feature in _FEATURES] for sensor_data in rows],
+                         dtype=np.float32).reshape(len(rows), _FEATURE_COUNT)
+            missing_columns = [_FEATURES[j] for j in np.flatnonzero(np.isnan(X).all(axis=0))] if rows else []
+            if missing_columns:
+                self.model_manager.logger.warning(f"⚠️ Missing data: {missing_columns}")
+            return self._predict_block(rows, X)
             
-            return {
-                'failure_probability': round(failure_probability, 4),
-                'prediction': int(prediction),
-                'predicted_failure_type': failure_type,
+        except Exception as e:
+            self.model_manager.logger.error(f"❌ Batch prediction error: {e}")
+            return [self._get_error_response(str(e)) for _ in rows]
+    
+    def _predict_block(self, rows: List[Dict[str, float]], X: np.ndarray) -> List[Dict[str, Any]]:
+        """Impute, scale and score a block of raw feature rows in one booster call"""
+        X_processed = self.preprocessor.transform_row(X)
+        margins = self._booster.inplace_predict(X_processed, predict_type='margin')
+        probabilities = 1.0 / (1.0 + np.exp(-margins))
+        return self._build_predictions(rows, X, probabilities, margins > 0)
+    
+    def _build_predictions(self, rows: List[Dict[str, float]], X: np.ndarray,
+                           probabilities: np.ndarray, predictions: np.ndarray) -> List[Dict[str, Any]]:
+        """Assemble prediction results for a block of sensor readings"""
+        features = _FEATURES
+        # Missing readings are NaN and never trigger a threshold rule
+        missing_mask = np.isnan(X)
+        
+        # Improve risk level determination
+        risk_index = self._calculate_risk_level(probabilities, X)
+        risk_levels = self._RISK_LEVELS[risk_index]
+        risk_colors = self._RISK_COLORS[risk_index]
+        
+        # Determine failure type
+        failure_types = self._determine_failure_type(X)
+        
+        # Generate recommendations
+        recommendations = self._generate_recommendations(X, probabilities, risk_index)
+        
+        feature_contributions = self._get_feature_contributions(X)
+        
+        # Python floats for the per-row rules, rounded in one pass for the results
+        probability_values = probabilities.tolist()
+        rounded_probabilities = np.round(probabilities.astype(np.float64), 4).tolist()
+        timestamp_ns = time.time_ns()
+        
+        results = []
+        for i, sensor_data in enumerate(rows):
+            failure_probability = probability_values[i]
+            results.append({
+                'failure_probability': rounded_probabilities[i],
+                'prediction': int(predictions[i]),
+                'predicted_failure_type': failure_types[i],
                 'confidence': round(self._calculate_confidence(failure_probability, sensor_data), 4),
-                'risk_level': risk_level,
-                'risk_color': risk_color,
-                'recommendations': recommendations,
-                'maintenance_timing': maintenance_timing,
-                'feature_contributions': self._get_feature_contributions(sensor_data),
-                'timestamp': datetime.now(),
+                'risk_level': risk_levels[i],
+                'risk_color': risk_colors[i],
+                'recommendations': recommendations[i],
+                # Suggested maintenance timing
+                'maintenance_timing': self._suggest_maintenance_timing(failure_probability, sensor_data),
+                'feature_contributions': feature_contributions[i],
+                'timestamp_ns': timestamp_ns,
                 'model_accuracy': self.accuracy,
-                'missing_features': missing_features
-            }
-            
-        except Exception as e:
-            self.model_manager.logger.error(f"❌ Prediction error: {e}")
-            return self._get_error_response(str(e))
+                'missing_features': [features[j] for j in np.flatnonzero(missing_mask[i])]
+            })
+        return results
+    
+    @staticmethod
+    def _rule_bits(X: np.ndarray, columns: np.ndarray, limits: np.ndarray, signs: np.ndarray) -> np.ndarray:
+        """Evaluate threshold rules (sign +1: above limit, -1: below limit) as a bitmask per row"""
+        if _HAS_NUMBA:
+            return _rule_bits_kernel(X, columns, limits, signs)
+        # The column gather is already a copy; flip signs in it instead of another temporary
+        values = X[:, columns]
+        np.multiply(values, signs, out=values, casting='unsafe')
+        return _bitmask(np.greater(values, limits * signs))
     
-    def _calculate_risk_level(self, probability: float, sensor_data: Dict[str, float]) -> Tuple[str, str]:
-        """Calculate risk level with colors"""
+    def _calculate_risk_level(self, probabilities: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """Calculate risk level index into _RISK_LEVELS/_RISK_COLORS"""
         # Additional factors affecting risk level
-        critical_factors = 0
-        if sensor_data.get('temperature', 0) > 85:
-            critical_factors += 1
-        if sensor_data.get('oil_level', 0) < 0.2:
-            critical_factors += 1
-        if sensor_data.get('vibration_x', 0) > 6.0:
-            critical_factors += 1
+        critical_factors = self._CRITICAL_COUNTS[self._rule_bits(
+            X, self._CRITICAL_COLUMNS, self._CRITICAL_LIMITS, self._CRITICAL_SIGNS
+        )]
         
         # Adjust risk level based on critical factors
-        adjusted_probability = probability + (critical_factors * 0.1)
-        
-        if adjusted_probability >= 0.8 or critical_factors >= 2:
-            return "Critical", "#dc3545"  # Red
-        elif adjusted_probability >= 0.6:
-            return "High", "#fd7e14"  # Orange
-        elif adjusted_probability >= 0.4:
-            return "Medium", "#ffc107"  # Yellow
-        elif adjusted_probability >= 0.2:
-            return "Low", "#20c997"  # Light green
-        else:
-            return "Normal", "#198754"  # Green
+        adjusted_probability = probabilities + (critical_factors * 0.1)
+        risk_index = np.searchsorted(self._RISK_BREAKPOINTS, adjusted_probability, side='right')
+        risk_index[critical_factors >= 2] = len(self._RISK_BREAKPOINTS)
+        return risk_index
     
     def _calculate_confidence(self, probability: float, sensor_data: Dict[str, float]) -> float:
         """Calculate prediction confidence"""
@@ -348,76 +903,32 @@ class AdvancedFailurePredictor:
         
         return min(base_confidence, 0.95)
     
-    def _determine_failure_type(self, sensor_data: Dict[str, float]) -> str:
-        """Determine potential failure type accurately"""
-        failure_types = []
-        
+    def _determine_failure_type(self, X: np.ndarray) -> List[str]:
+        """Determine potential failure types accurately"""
         # Use dynamic thresholds based on feature importance
         vibration_threshold = 4.5 + (self.feature_importance.get('vibration_x', 0) * 2)
         temperature_threshold = 80 + (self.feature_importance.get('temperature', 0) * 10)
+        limits = np.array([vibration_threshold] * 3 + [temperature_threshold] + self._FAILURE_FIXED_LIMITS)
         
-        if sensor_data.get('vibration_x', 0) > vibration_threshold:
-            failure_types.append("X-axis imbalance")
-        if sensor_data.get('vibration_y', 0) > vibration_threshold:
-            failure_types.append("Y-axis imbalance")
-        if sensor_data.get('vibration_z', 0) > vibration_threshold:
-            failure_types.append("Z-axis imbalance")
-        if sensor_data.get('temperature', 0) > temperature_threshold:
-            failure_types.append("Overheating")
-        if sensor_data.get('oil_level', 0) < 0.3:
-            failure_types.append("Low oil level")
-        if sensor_data.get('oil_quality', 0) < 0.4:
-            failure_types.append("Oil contamination")
-        if sensor_data.get('bearing_temperature', 0) > 85:
-            failure_types.append("Bearing damage")
-        if sensor_data.get('flow_rate', 0) < 50:
-            failure_types.append("Low efficiency")
-        
-        return ", ".join(failure_types) if failure_types else "No obvious failures"
+        mask = self._rule_bits(X, self._FAILURE_COLUMNS, limits, self._FAILURE_SIGNS)
+        return self._FAILURE_DESCRIPTIONS[mask].tolist()
     
-    def _generate_recommendations(self, sensor_data: Dict[str, float], probability: float, risk_level: str) -> List[str]:
+    def _generate_recommendations(self, X: np.ndarray, probabilities: np.ndarray,
+                                  risk_index: np.ndarray) -> List[List[str]]:
         """Generate intelligent recommendations based on data"""
-        recommendations = []
-        priority = 1
-        
-        # Urgent recommendations
-        if risk_level in ["Critical", "High"]:
-            recommendations.append(f"{priority}. Stop pump immediately and contact technical support")
-            priority += 1
-        
-        if sensor_data.get('oil_level', 0) < 0.2:
-            recommendations.append(f"{priority}. Urgent oil addition (level very low)")
-            priority += 1
-        
-        if sensor_data.get('temperature', 0) > 90:
-            recommendations.append(f"{priority}. Urgent pump cooling")
-            priority += 1
-        
-        # Preventive recommendations
-        if probability > 0.6:
-            recommendations.append(f"{priority}. Schedule urgent maintenance within 24 hours")
-            priority += 1
-        elif probability > 0.4:
-            recommendations.append(f"{priority}. Schedule maintenance within 3 days")
-            priority += 1
-        elif probability > 0.2:
-            recommendations.append(f"{priority}. Preventive maintenance within a week")
-            priority += 1
-        
-        if sensor_data.get('oil_quality', 0) < 0.5:
-            recommendations.append(f"{priority}. Replace oil at the earliest opportunity")
-            priority += 1
-        
-        if any(v > 4.0 for v in [sensor_data.get('vibration_x', 0), 
-                                sensor_data.get('vibration_y', 0), 
-                                sensor_data.get('vibration_z', 0)]):
-            recommendations.append(f"{priority}. Check balance and bearings")
-            priority += 1
-        
-        if not recommendations:
-            recommendations.append("Pump operating normally - continue periodic monitoring")
+        sensor_bits = self._rule_bits(
+            X, self._RECOMMENDATION_COLUMNS, self._RECOMMENDATION_LIMITS, self._RECOMMENDATION_SIGNS
+        )
+        tier = np.searchsorted(self._MAINTENANCE_BREAKPOINTS, probabilities, side='left')
+        # Bit i selects _RECOMMENDATION_TEXTS[i]
+        conditions = (
+            (risk_index >= 3)  # High or Critical
+            | self._MAINTENANCE_BITS[tier]
+            | self._SENSOR_RECOMMENDATION_BITS[sensor_bits]
+        )
         
-        return recommendations
+        # Copies, so callers can't modify the shared lookup table
+        return [list(selected) for selected in self._RECOMMENDATION_LISTS[conditions]]
     
     def _suggest_maintenance_timing(self, probability: float, sensor_data: Dict[str, float]) -> str:
         """Suggest maintenance timing"""
@@ -434,18 +945,22 @@ class AdvancedFailurePredictor:
         else:
             return "Routine (every 3 months)"
     
-    def _get_feature_contributions(self, sensor_data: Dict[str, float]) -> Dict[str, float]:
-        """Get feature contributions to prediction"""
-        contributions = {}
+    def _set_feature_importance(self, feature_importance: Dict[str, float]):
+        """Store feature importance with the aligned contribution weights"""
+        self.feature_importance = feature_importance
+        self._contribution_names = list(feature_importance)
+        self._contribution_columns = _feature_positions(*feature_importance)
+        self._contribution_weights = np.array(list(feature_importance.values()), dtype=np.float64)
+    
+    def _get_feature_contributions(self, X: np.ndarray) -> List[Dict[str, float]]:
+        """Get feature contributions to prediction for each row"""
         try:
-            for feature, importance in self.feature_importance.items():
-                value = sensor_data.get(feature, 0)
-                # Calculate approximate contribution
-                contributions[feature] = round(value * importance * 10, 4)
+            # Missing readings contribute nothing
+            values = np.nan_to_num(X[:, self._contribution_columns].astype(np.float64))
+            contributions = _contribution_kernel(values, self._contribution_weights)
+            return [dict(zip(self._contribution_names, row)) for row in contributions.tolist()]
         except Exception:
-            pass
-        
-        return contributions
+            return [{} for _ in range(len(X))]
     
     def _get_error_response(self, error_msg: str) -> Dict[str, Any]:
         """Return structured error response"""
@@ -459,7 +974,7 @@ class AdvancedFailurePredictor:
             'recommendations': ['Check AI system', 'Review logs'],
             'maintenance_timing': 'Unspecified',
             'feature_contributions': {},
-            'timestamp': datetime.now(),
+            'timestamp_ns': time.time_ns(),
             'model_accuracy': 0.0,
             'error': error_msg
         }
@@ -472,22 +987,99 @@ class AdvancedFailurePredictor:
             'model_type': self.model_type,
             'feature_importance': self.feature_importance,
             'last_trained': self.model_manager.model_history[-1]['timestamp'] if self.model_manager.model_history else 'Not available',
-            'features_count': len(AI_MODELS_CONFIG['failure_prediction']['features'])
+            'features_count': _FEATURE_COUNT
         }
 
+class RunningRobustScaler:
+    """Median/IQR scaler updated per window instead of refit from scratch"""
+    
+    def __init__(self, momentum: float = 0.2):
+        self.momentum = momentum
+        self.center_ = None
+        self.scale_ = None
+    
+    def partial_fit(self, X: np.ndarray) -> 'RunningRobustScaler':
+        """Blend the window's median and IQR into the running statistics"""
+        q25, median, q75 = np.percentile(X, [25, 50, 75], axis=0).astype(X.dtype)
+        iqr = q75 - q25
+        iqr[iqr == 0] = 1.0  # Constant features stay unscaled
+        
+        if self.center_ is None:
+            self.center_, self.scale_ = median, iqr
+        else:
+            self.center_ += self.momentum * (median - self.center_)
+            self.scale_ += self.momentum * (iqr - self.scale_)
+        return self
+    
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Scale with the current running statistics"""
+        return (X - self.center_) / self.scale_
+
+class HistogramOutlierScorer:
+    """Histogram-based outlier score (HBOS), a fast alternative to the isolation forest"""
+    
+    def __init__(self, n_bins: int = 10):
+        self.n_bins = n_bins
+        self.low_ = None
+        self.width_ = None
+        self.log_density_ = None
+    
+    def _bins(self, X: np.ndarray) -> np.ndarray:
+        """Histogram bin of every value, per feature"""
+        bins = ((X - self.low_) / self.width_).astype(np.intp)
+        return np.clip(bins, 0, self.n_bins - 1, out=bins)
+    
+    def fit(self, X: np.ndarray) -> 'HistogramOutlierScorer':
+        """Build one equal-width histogram per feature"""
+        self.low_ = X.min(axis=0)
+        width = (X.max(axis=0) - self.low_) / self.n_bins
+        width[width == 0] = 1.0  # Constant features fall into a single bin
+        self.width_ = width
+        
+        n_features = X.shape[1]
+        cells = self._bins(X) * n_features + np.arange(n_features)
+        counts = np.bincount(cells.ravel(), minlength=self.n_bins * n_features).reshape(self.n_bins, n_features)
+        # Laplace-smoothed heights relative to the tallest bin of each feature
+        self.log_density_ = np.log((counts + 1) / (counts.max(axis=0) + 1))
+        return self
+    
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Summed log bin heights; like IsolationForest, lower means more abnormal"""
+        return self.log_density_[self._bins(X), np.arange(X.shape[1])].sum(axis=1)
+
 class AdvancedAnomalyDetector:
     """Advanced anomaly detector"""
     
+    # Calls scored with the current detector before it is refit
+    REFIT_INTERVAL = 1000
+    
     def __init__(self):
-        self.detector = IsolationForest(
-            contamination=0.1,
-            random_state=42,
-            n_estimators=100
-        )
-        self.scaler = RobustScaler()
+        if AI_MODELS_CONFIG['anomaly_detection'].get('method') == 'hbos':
+            self.detector = HistogramOutlierScorer()
+        else:
+            self.detector = IsolationForest(
+                contamination=0.1,
+                random_state=42,
+                n_estimators=100,
+                n_jobs=1  # Windows are small; thread start-up costs more than the trees
+            )
+        self.scaler = RunningRobustScaler()
         self.is_trained = False
+        self._fit_countdown = 0
         self.logger = logging.getLogger(__name__)
     
+    def fit(self, sensor_data: pd.DataFrame) -> 'AdvancedAnomalyDetector':
+        """Fit the scaler and detector on historical readings ahead of scoring"""
+        self._fit(_fill_gaps(sensor_data.reindex(columns=_FEATURES).to_numpy(dtype=np.float32)))
+        return self
+    
+    def _fit(self, X: np.ndarray):
+        """Move the scaler and refit the detector on its output, restarting the refit countdown"""
+        self.scaler.partial_fit(X)
+        self.detector.fit(self.scaler.transform(X))
+        self.is_trained = True
+        self._fit_countdown = self.REFIT_INTERVAL
+    
     def detect_anomalies(self, sensor_data: pd.DataFrame, sensitivity: float = 0.5) -> pd.DataFrame:
         """Detect anomalies with missing feature logging"""
         try:
@@ -505,7 +1097,7 @@ class AdvancedAnomalyDetector:
                 self.logger.warning("Insufficient data for anomaly detection")
                 return sensor_data
 
-            features = AI_MODELS_CONFIG['failure_prediction']['features']
+            features = _FEATURES
 
             # Log missing features
             missing = [f for f in features if f not in sensor_data.columns]
@@ -516,12 +1108,21 @@ class AdvancedAnomalyDetector:
                     sensor_data[m] = np.nan
 
             # Reindex according to required order and temporarily fill
-            X = sensor_data.reindex(columns=features).fillna(method='ffill').fillna(0)
+            X = _fill_gaps(sensor_data.reindex(columns=features).to_numpy(dtype=np.float32))
+
+            # Fit once, then only score until the refit interval runs out;
+            # the scaler moves only when the detector is refit on its output
+            if not self.is_trained or self._fit_countdown <= 0:
+                self._fit(X)
+            else:
+                self._fit_countdown -= 1
 
-            X_scaled = self.scaler.fit_transform(X)
+            # Trees work in float32; the scaler keeps the input dtype
+            X_scaled = self.scaler.transform(X)
 
-            scores = self.detector.fit_predict(X_scaled)
-            anomaly_scores = self.detector.decision_function(X_scaled)
+            # One forest traversal; score_samples only differs from
+            # decision_function by offset_, which the normalization removes
+            anomaly_scores = self.detector.score_samples(X_scaled)
             
             # Convert results to appropriate format
             norm_scores = (anomaly_scores - np.min(anomaly_scores)) / (np.ptp(anomaly_scores) + 1e-9)
@@ -547,6 +1148,31 @@ class AdvancedAnomalyDetector:
                 sensor_data['anomaly_severity'] = 'low'
             return sensor_data
 
-# Create global instances of advanced models
-failure_predictor = AdvancedFailurePredictor()
-anomaly_detector = AdvancedAnomalyDetector()
\ No newline at end of file
+class _LazyInstance:
+    """Proxy that constructs the wrapped model on first attribute access"""
+    
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+    
+    def _get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, '_instance', self._factory())
+        return self._instance
+    
+    def warm_up(self):
+        """Construct the instance on a background thread"""
+        threading.Thread(target=self._get, daemon=True).start()
+    
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+# Create global instances of advanced models; each loads on first use or warm_up()
+failure_predictor = _LazyInstance(AdvancedFailurePredictor)
+anomaly_detector = _LazyInstance(AdvancedAnomalyDetector)
\ No newline at end of file
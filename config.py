@@ -3,9 +3,11 @@ iPump Application Settings
 """
 
 import os
+import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from datetime import datetime
-from PyQt6.QtCore import QSize
+from types import MappingProxyType
 
 # Paths
 BASE_DIR = Path(__file__).parent
@@ -14,96 +16,130 @@ MODELS_DIR = BASE_DIR / "models"
 LOGS_DIR = BASE_DIR / "logs"
 REPORTS_DIR = BASE_DIR / "reports"
 
-# Create necessary directories
-for directory in [DATA_DIR, MODELS_DIR, LOGS_DIR, REPORTS_DIR]:
-    directory.mkdir(exist_ok=True)
+def _is_child_process() -> bool:
+    """True inside a multiprocessing worker, without importing multiprocessing"""
+    multiprocessing = sys.modules.get('multiprocessing')
+    return multiprocessing is not None and multiprocessing.parent_process() is not None
+
+# Create necessary directories; on the usual path they already exist and
+# one listing of BASE_DIR replaces a check per directory. Worker processes
+# skip this, their parent imported config and prepared them first.
+if not _is_child_process():
+    with os.scandir(BASE_DIR) as entries:
+        _existing = {entry.name for entry in entries}
+    for directory in (DATA_DIR, MODELS_DIR, LOGS_DIR, REPORTS_DIR):
+        if directory.name not in _existing:
+            os.makedirs(directory, exist_ok=True)
+
+# Settings are read-only views; nested values are plain containers
 
 # Database Settings
-DATABASE_CONFIG = {
+DATABASE_CONFIG = MappingProxyType({
     'host': 'localhost',
     'port': 5432,
     'database': 'ipump_db',
     'user': 'ipump_user',
     'password': 'ipump_password'
-}
+})
 
 # AI Models Settings
-AI_MODELS_CONFIG = {
+_FAILURE_FEATURES = [
+    'vibration_x', 'vibration_y', 'vibration_z',
+    'temperature', 'pressure', 'flow_rate',
+    'power_consumption', 'operating_hours',
+    'bearing_temperature', 'oil_level', 'oil_quality'
+]
+
+AI_MODELS_CONFIG = MappingProxyType({
     'failure_prediction': {
         'model_path': MODELS_DIR / 'failure_model.pkl',
-        'features': [
-            'vibration_x', 'vibration_y', 'vibration_z',
-            'temperature', 'pressure', 'flow_rate',
-            'power_consumption', 'operating_hours',
-            'bearing_temperature', 'oil_level', 'oil_quality'
-        ],
+        'features': _FAILURE_FEATURES,
+        # Column position of each feature, for O(1) lookups
+        'feature_index': {name: i for i, name in enumerate(_FAILURE_FEATURES)},
+        'feature_count': len(_FAILURE_FEATURES),
         'threshold': 0.85,
         # Path to the real training data file (CSV format for example)
         'training_data_file': DATA_DIR / 'training_data.csv'
     },
     'anomaly_detection': {
         'model_path': MODELS_DIR / 'anomaly_model.pkl',
-        'sensitivity': 0.9
+        'sensitivity': 0.9,
+        'method': 'isolation_forest'  # or 'hbos' for the histogram-based scorer
     }
-}
+})
+
+@dataclass(slots=True, frozen=True)
+class WindowConfig:
+    """Main window size limits and presets, (width, height) in pixels"""
+    default_size: tuple
+    presets: MappingProxyType
+    min_size: tuple
+    max_size: tuple
 
 # UI Settings
-UI_CONFIG = {
+UI_CONFIG = MappingProxyType({
     'theme': 'dark',
     'language': 'en',  # Changed default language to English
     'refresh_interval': 5000,  # milliseconds
     'chart_points': 100,
     # Window size settings for a real application
-    'window': {
-        'default_size': (1200, 800),   # width, height
-        'presets': {
+    'window': WindowConfig(
+        default_size=(1200, 800),   # width, height
+        presets=MappingProxyType({
             'small': (800, 600),
             'medium': (1024, 768),
             'large': (1366, 900),
             'default': (1200, 800)
-        },
-        'min_size': (640, 480),
-        'max_size': (3840, 2160)
-    }
-}
+        }),
+        min_size=(640, 480),
+        max_size=(3840, 2160)
+    )
+})
 
 # System Settings
-SYSTEM_CONFIG = {
+SYSTEM_CONFIG = MappingProxyType({
     'max_log_files': 10,
     'log_level': 'INFO',
     'backup_interval': 24,  # hours
     'data_retention_days': 365
-}
+})
 
 # Pump Settings
-PUMP_CONFIG = {
+PUMP_CONFIG = MappingProxyType({
     'critical_temperature': 85,  # Celsius
     'max_vibration': 7.5,  # m/s^2
     'min_oil_level': 0.2,  # 20%
     'maintenance_interval': 720  # hours
+})
+
+_SENSOR_TYPES = [
+    'vibration_x', 'vibration_y', 'vibration_z',
+    'temperature', 'pressure', 'flow_rate',
+    'power_consumption', 'oil_level', 'oil_quality',
+    'bearing_temperature'
+]
+
+_MEASUREMENT_UNITS = {
+    'vibration': 'm/s^2',
+    'temperature': 'C',
+    'pressure': 'bar',
+    'flow_rate': 'm3/h',
+    'power_consumption': 'kW',
+    'oil_level': '%',
+    'oil_quality': '%'
 }
 
-SENSOR_CONFIG = {
+SENSOR_CONFIG = MappingProxyType({
     'default_sampling_rate': 10,  # Hz
     'calibration_interval': 90,   # days
-    'sensor_types': [
-        'vibration_x', 'vibration_y', 'vibration_z',
-        'temperature', 'pressure', 'flow_rate',
-        'power_consumption', 'oil_level', 'oil_quality',
-        'bearing_temperature'
-    ],
-    'measurement_units': {
-        'vibration': 'm/s^2',
-        'temperature': 'C',
-        'pressure': 'bar',
-        'flow_rate': 'm3/h',
-        'power_consumption': 'kW',
-        'oil_level': '%',
-        'oil_quality': '%'
-    }
-}
+    'sensor_types': _SENSOR_TYPES,
+    'measurement_units': MappingProxyType(_MEASUREMENT_UNITS)
+})
+
+# Evaluated once at import
+_YEAR = time.localtime().tm_year
 
-APP_CONFIG = {
+APP_CONFIG = MappingProxyType({
     'name': 'iPump - Intelligent Pump Failure Prediction System',
     'version': '1.0.0',
     'description': 'An integrated system for predicting pump failure using AI.',
@@ -112,5 +148,29 @@ APP_CONFIG = {
     'location': 'Dhi Qar, Iraq',
     'email': 'ah343238@gmail.com',
     'company': 'Hussein Abdullah',
-    'copyright': f'Copyright {datetime.now().year} Hussein Abdullah'
-}
\ No newline at end of file
+    'copyright': f'Copyright {_YEAR} Hussein Abdullah'
+})
+
+def _validate_config():
+    """Check settings once at import so readers can use them unchecked"""
+    errors = []
+    if UI_CONFIG['theme'] not in ('dark', 'light'):
+        errors.append(f"UI_CONFIG['theme'] must be 'dark' or 'light', got {UI_CONFIG['theme']!r}")
+    if not isinstance(UI_CONFIG['refresh_interval'], int) or UI_CONFIG['refresh_interval'] < 1000:
+        errors.append("UI_CONFIG['refresh_interval'] must be an int of at least 1000 ms")
+    if not isinstance(UI_CONFIG['chart_points'], int) or UI_CONFIG['chart_points'] <= 0:
+        errors.append("UI_CONFIG['chart_points'] must be a positive int")
+    window = UI_CONFIG['window']
+    for name, (width, height) in (('default_size', window.default_size), *window.presets.items()):
+        if not (window.min_size[0] <= width <= window.max_size[0]
+                and window.min_size[1] <= height <= window.max_size[1]):
+            errors.append(f"Window size {name!r} ({width}x{height}) is outside min_size/max_size")
+    for key in ('critical_temperature', 'max_vibration', 'min_oil_level', 'maintenance_interval'):
+        if not isinstance(PUMP_CONFIG[key], (int, float)) or PUMP_CONFIG[key] <= 0:
+            errors.append(f"PUMP_CONFIG[{key!r}] must be a positive number")
+    if not 0 < AI_MODELS_CONFIG['failure_prediction']['threshold'] < 1:
+        errors.append("AI_MODELS_CONFIG['failure_prediction']['threshold'] must be between 0 and 1")
+    if errors:
+        raise ValueError("Invalid configuration:\n" + "\n".join(errors))
+
+_validate_config()
\ No newline at end of file
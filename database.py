@@ -3,26 +3,114 @@ Database management module for the iPump application with pump and sensor tables
 """
 
 import sqlite3
+import threading
+import time
+import numpy as np
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Union
 import logging
 from pathlib import Path
-from PyQt6.QtCore import QSize
 
 from config import DATABASE_CONFIG, BASE_DIR
 
+# Reading columns of sensor_data, in insert order
+SENSOR_COLUMNS = (
+    'vibration_x', 'vibration_y', 'vibration_z', 'temperature',
+    'pressure', 'flow_rate', 'power_consumption', 'bearing_temperature',
+    'oil_level', 'oil_quality', 'operating_hours'
+)
+# Rows fetched per round trip when streaming history into arrays
+_FETCH_CHUNK = 2048
+_INSERT_SENSOR_SQL = (
+    'INSERT INTO sensor_data (pump_id, sensor_id, timestamp, ' + ', '.join(SENSOR_COLUMNS) + ') '
+    'VALUES (' + ', '.join('?' * (3 + len(SENSOR_COLUMNS))) + ')'
+)
+
+def _row_to_dict(cursor: sqlite3.Cursor) -> Dict[str, Any]:
+    """First row of a cursor as a column -> value dict, or {} when empty."""
+    row = cursor.fetchone()
+    if row is None:
+        return {}
+    return dict(zip([column[0] for column in cursor.description], row))
+
 class DatabaseManager:
+    # Sensor readings are written in batches of this many rows, or once the
+    # oldest buffered reading is this many seconds old
+    SENSOR_BATCH_SIZE = 500
+    SENSOR_FLUSH_INTERVAL = 2.0
+    # Stored in PRAGMA user_version once init_database has run; bump it
+    # whenever the tables or indexes below change so existing files migrate
+    SCHEMA_VERSION = 2
+    
     def __init__(self):
         self.db_path = BASE_DIR / "data" / "ipump.db"
         self.logger = logging.getLogger(__name__)
+        # One connection for the whole process, shared by the UI and worker
+        # threads; the re-entrant lock serializes access to it
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._sensor_buffer = []
+        self._flush_timer = None
+        self._stamp = (0, '')
+        self._configure_connection()
         self.init_database()
     
+    def _configure_connection(self):
+        """Apply journal and cache settings once to the shared connection."""
+        # WAL lets dashboard reads run alongside sensor writes; it keeps
+        # ipump.db-wal and ipump.db-shm files next to the database
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # Safe with WAL: a power loss can drop the last commits, never corrupt
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-65536')  # 64 MiB
+        self._conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+        # Enforce the ON DELETE CASCADE / SET NULL rules declared in the schema
+        self._conn.execute('PRAGMA foreign_keys=ON')
+    
+    @contextmanager
+    def _transaction(self):
+        """Hold the shared connection; commit on success, roll back on error."""
+        with self._lock:
+            # Pending readings go in first so every query sees them
+            if self._sensor_buffer:
+                self._write_sensor_buffer()
+            with self._conn:
+                yield self._conn
+    
+    def _write_sensor_buffer(self):
+        """Insert all buffered sensor readings in one transaction; lock must be held."""
+        rows, self._sensor_buffer = self._sensor_buffer, []
+        try:
+            with self._conn:
+                self._conn.executemany(_INSERT_SENSOR_SQL, rows)
+            return
+        except Exception as e:
+            self.logger.warning(f"Batched sensor data save failed ({len(rows)} readings), retrying one by one: {e}")
+        # One bad reading (e.g. a deleted pump_id) must not take the batch down with it
+        dropped = 0
+        for row in rows:
+            try:
+                with self._conn:
+                    self._conn.execute(_INSERT_SENSOR_SQL, row)
+            except Exception as e:
+                dropped += 1
+                self.logger.error(f"Sensor data save error (pump {row[0]}): {e}")
+        if dropped:
+            self.logger.error(f"Dropped {dropped} of {len(rows)} sensor readings")
+    
     def init_database(self):
         """Initialize the database and create tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
+                # Tables, indexes and sample data are already in place
+                if conn.execute('PRAGMA user_version').fetchone()[0] == self.SCHEMA_VERSION:
+                    self.logger.info("Database schema is up to date")
+                    return
+                
                 # Pumps table
                 conn.execute('''
                     CREATE TABLE IF NOT EXISTS pumps (
@@ -145,16 +233,24 @@ class DatabaseManager:
                 ''')
                 
                 # Create indexes to improve performance
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_sensor_data_pump_id ON sensor_data(pump_id)')
+                # (pump_id, timestamp) serves per-pump history ranges, latest
+                # reading and MAX(timestamp); it supersedes the pump_id-only ones
+                conn.execute('DROP INDEX IF EXISTS idx_sensor_data_pump_id')
+                conn.execute('DROP INDEX IF EXISTS idx_predictions_pump_id')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_sensor_data_pump_ts ON sensor_data(pump_id, timestamp)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_sensor_data_timestamp ON sensor_data(timestamp)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_sensors_pump_id ON sensors(pump_id)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_predictions_pump_id ON predictions(pump_id)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_predictions_pump_ts ON predictions(pump_id, timestamp)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_maintenance_pump_id ON maintenance(pump_id)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_pump_id ON alerts(pump_id)')
+                # Partial index: only unresolved alerts, already in display order
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_active_ts ON alerts(timestamp DESC) WHERE resolved = FALSE')
                 
                 # Insert sample pump data
                 self._insert_sample_data(conn)
                 
+                conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+                
             self.logger.info("Database initialized successfully")
             
         except Exception as e:
@@ -209,7 +305,7 @@ class DatabaseManager:
     def add_pump(self, pump_data: Dict[str, Any]) -> int:
         """Add a new pump."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.execute('''
                     INSERT INTO pumps (name, location, type, installation_date, status, notes)
                     VALUES (?, ?, ?, ?, ?, ?)
@@ -243,7 +339,7 @@ class DatabaseManager:
     def update_pump(self, pump_id: int, pump_data: Dict[str, Any]) -> bool:
         """Update pump information."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute('''
                     UPDATE pumps 
                     SET name = ?, location = ?, type = ?, installation_date = ?, 
@@ -278,7 +374,7 @@ class DatabaseManager:
     def delete_pump(self, pump_id: int) -> bool:
         """Delete a pump."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 # Retrieve the pump name before deletion for logging
                 pump_name = conn.execute('SELECT name FROM pumps WHERE id = ?', (pump_id,)).fetchone()
                 
@@ -298,19 +394,19 @@ class DatabaseManager:
             self.logger.error(f"Pump deletion error: {e}")
             return False
     
-    def get_pump(self, pump_id: int) -> pd.DataFrame:
+    def get_pump(self, pump_id: int) -> Dict[str, Any]:
         """Fetch data for a specific pump."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                return pd.read_sql('SELECT * FROM pumps WHERE id = ?', conn, params=(pump_id,))
+            with self._transaction() as conn:
+                return _row_to_dict(conn.execute('SELECT * FROM pumps WHERE id = ?', (pump_id,)))
         except Exception as e:
             self.logger.error(f"Pump retrieval error: {e}")
-            return pd.DataFrame()
+            return {}
     
     def get_pumps(self) -> pd.DataFrame:
         """Retrieve all pumps."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 return pd.read_sql('''
                     SELECT *, 
                     CASE 
@@ -328,16 +424,29 @@ class DatabaseManager:
     def get_pumps_with_stats(self) -> pd.DataFrame:
         """Retrieve pumps with statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
+                # Counts are grouped once per table instead of joining sensors
+                # and alerts into one cross product; last_reading stays a
+                # per-pump seek on idx_sensor_data_pump_ts, which beats
+                # grouping every reading
                 return pd.read_sql('''
+                    WITH sensor_counts AS (
+                        SELECT pump_id, COUNT(*) AS sensor_count
+                        FROM sensors WHERE status = 'active'
+                        GROUP BY pump_id
+                    ),
+                    alert_counts AS (
+                        SELECT pump_id, COUNT(*) AS active_alerts
+                        FROM alerts WHERE resolved = FALSE
+                        GROUP BY pump_id
+                    )
                     SELECT p.*, 
-                    COUNT(DISTINCT s.id) as sensor_count,
-                    COUNT(DISTINCT a.id) as active_alerts,
+                    COALESCE(sc.sensor_count, 0) as sensor_count,
+                    COALESCE(ac.active_alerts, 0) as active_alerts,
                     (SELECT MAX(timestamp) FROM sensor_data sd WHERE sd.pump_id = p.id) as last_reading
                     FROM pumps p
-                    LEFT JOIN sensors s ON p.id = s.pump_id AND s.status = 'active'
-                    LEFT JOIN alerts a ON p.id = a.pump_id AND a.resolved = FALSE
-                    GROUP BY p.id
+                    LEFT JOIN sensor_counts sc ON sc.pump_id = p.id
+                    LEFT JOIN alert_counts ac ON ac.pump_id = p.id
                     ORDER BY p.name
                 ''', conn)
         except Exception as e:
@@ -348,7 +457,7 @@ class DatabaseManager:
     def add_sensor(self, sensor_data: Dict[str, Any]) -> int:
         """Add a new sensor."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.execute('''
                     INSERT INTO sensors (pump_id, sensor_type, sensor_id, model, manufacturer, 
                                       measurement_range, accuracy, installation_date, calibration_date, sampling_rate)
@@ -390,7 +499,7 @@ class DatabaseManager:
     def update_sensor(self, sensor_id: int, sensor_data: Dict[str, Any]) -> bool:
         """Update sensor information."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute('''
                     UPDATE sensors 
                     SET sensor_type = ?, model = ?, manufacturer = ?, measurement_range = ?,
@@ -418,7 +527,7 @@ class DatabaseManager:
     def delete_sensor(self, sensor_id: int) -> bool:
         """Delete a sensor."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute('DELETE FROM sensors WHERE id = ?', (sensor_id,))
                 self.logger.info(f"Deleted sensor with id: {sensor_id}")
                 return True
@@ -427,24 +536,24 @@ class DatabaseManager:
             self.logger.error(f"Sensor deletion error: {e}")
             return False
     
-    def get_sensor(self, sensor_id: int) -> pd.DataFrame:
+    def get_sensor(self, sensor_id: int) -> Dict[str, Any]:
         """Fetch data for a specific sensor."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                return pd.read_sql('''
+            with self._transaction() as conn:
+                return _row_to_dict(conn.execute('''
                     SELECT s.*, p.name as pump_name 
                     FROM sensors s 
                     JOIN pumps p ON s.pump_id = p.id 
                     WHERE s.id = ?
-                ''', conn, params=(sensor_id,))
+                ''', (sensor_id,)))
         except Exception as e:
             self.logger.error(f"Sensor retrieval error: {e}")
-            return pd.DataFrame()
+            return {}
     
     def get_pump_sensors(self, pump_id: int) -> pd.DataFrame:
         """Retrieve sensors linked to a pump."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 return pd.read_sql('''
                     SELECT s.*, 
                     CASE 
@@ -462,7 +571,7 @@ class DatabaseManager:
     def get_all_sensors(self) -> pd.DataFrame:
         """Retrieve all sensors."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 return pd.read_sql('''
                     SELECT s.*, p.name as pump_name, p.location
                     FROM sensors s 
@@ -476,21 +585,27 @@ class DatabaseManager:
     def link_sensors_to_pump(self, pump_id: int, sensors_data: List[Dict[str, Any]]) -> bool:
         """Link multiple sensors to a pump."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for sensor_data in sensors_data:
-                    conn.execute('''
-                        INSERT OR REPLACE INTO sensors 
-                        (pump_id, sensor_type, sensor_id, model, installation_date, calibration_date, sampling_rate)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        pump_id,
-                        sensor_data['sensor_type'],
-                        sensor_data['sensor_id'],
-                        sensor_data.get('model', 'Generic'),
-                        datetime.now().strftime('%Y-%m-%d'),
-                        datetime.now().strftime('%Y-%m-%d'),
-                        sensor_data.get('sampling_rate', 10)
-                    ))
+            today = datetime.now().strftime('%Y-%m-%d')
+            rows = [
+                (
+                    pump_id,
+                    sensor_data['sensor_type'],
+                    sensor_data['sensor_id'],
+                    sensor_data.get('model', 'Generic'),
+                    today,
+                    today,
+                    sensor_data.get('sampling_rate', 10)
+                )
+                for sensor_data in sensors_data
+            ]
+            with self._transaction() as conn:
+                # Take the write lock up front so the batch cannot stall halfway
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany('''
+                    INSERT OR REPLACE INTO sensors 
+                    (pump_id, sensor_type, sensor_id, model, installation_date, calibration_date, sampling_rate)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
                 
                 # Record the action in the log
                 conn.execute('''
@@ -515,60 +630,109 @@ class DatabaseManager:
         ]
     
     # Sensor data methods
-    def save_sensor_data(self, pump_id: int, data: Dict[str, float], sensor_id: int = None):
-        """Save sensor data."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT INTO sensor_data 
-                    (pump_id, sensor_id, vibration_x, vibration_y, vibration_z, temperature, 
-                     pressure, flow_rate, power_consumption, bearing_temperature, 
-                     oil_level, oil_quality, operating_hours)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    pump_id, 
-                    sensor_id,
-                    data.get('vibration_x'),
-                    data.get('vibration_y'),
-                    data.get('vibration_z'),
-                    data.get('temperature'),
-                    data.get('pressure'),
-                    data.get('flow_rate'),
-                    data.get('power_consumption'),
-                    data.get('bearing_temperature'),
-                    data.get('oil_level'),
-                    data.get('oil_quality'),
-                    data.get('operating_hours')
-                ))
-                
-        except Exception as e:
-            self.logger.error(f"Sensor data save error: {e}")
+    def _current_timestamp(self) -> str:
+        """UTC time in the CURRENT_TIMESTAMP format, formatted once per second."""
+        second = int(time.time())
+        stamp = self._stamp
+        if stamp[0] != second:
+            stamp = self._stamp = (second, time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(second)))
+        return stamp[1]
     
-    def get_latest_sensor_data(self, pump_id: int) -> pd.DataFrame:
+    def save_sensor_data(self, pump_id: int, data: Union[Dict[str, float], Sequence[float]],
+                         sensor_id: int = None):
+        """Save sensor data, a dict or values in SENSOR_COLUMNS order; written in batches."""
+        if isinstance(data, dict):
+            # Spelled out in SENSOR_COLUMNS order; faster than a map over the keys
+            values = (
+                data.get('vibration_x'),
+                data.get('vibration_y'),
+                data.get('vibration_z'),
+                data.get('temperature'),
+                data.get('pressure'),
+                data.get('flow_rate'),
+                data.get('power_consumption'),
+                data.get('bearing_temperature'),
+                data.get('oil_level'),
+                data.get('oil_quality'),
+                data.get('operating_hours')
+            )
+        else:
+            values = tuple(data)
+            if len(values) != len(SENSOR_COLUMNS):
+                # One malformed row would fail the whole batch
+                self.logger.error(f"Sensor data save error: expected {len(SENSOR_COLUMNS)} values, got {len(values)}")
+                return
+        # Stamped on arrival, not at flush time
+        row = (pump_id, sensor_id, self._current_timestamp()) + values
+        with self._lock:
+            if not self._sensor_buffer:
+                # Bounds how long a reading waits when no further ones arrive
+                self._flush_timer = threading.Timer(self.SENSOR_FLUSH_INTERVAL, self.flush_sensor_data)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            self._sensor_buffer.append(row)
+            if len(self._sensor_buffer) >= self.SENSOR_BATCH_SIZE:
+                self._write_sensor_buffer()
+    
+    def flush_sensor_data(self):
+        """Write any buffered sensor readings now."""
+        with self._lock:
+            if self._sensor_buffer:
+                self._write_sensor_buffer()
+    
+    def get_latest_sensor_data(self, pump_id: int) -> Dict[str, Any]:
         """Fetch the latest sensor data for a pump."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 query = '''
                     SELECT * FROM sensor_data 
                     WHERE pump_id = ? 
                     ORDER BY timestamp DESC 
                     LIMIT 1
                 '''
-                return pd.read_sql(query, conn, params=(pump_id,))
+                return _row_to_dict(conn.execute(query, (pump_id,)))
         except Exception as e:
             self.logger.error(f"Latest sensor data retrieval error: {e}")
-            return pd.DataFrame()
+            return {}
     
     def get_sensor_data_history(self, pump_id: int, hours: int = 24) -> pd.DataFrame:
         """Retrieve sensor data history."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                query = '''
-                    SELECT * FROM sensor_data 
+            with self._transaction() as conn:
+                params = (pump_id, f'-{hours} hours')
+                count = conn.execute('''
+                    SELECT COUNT(*) FROM sensor_data 
+                    WHERE pump_id = ? AND timestamp >= datetime('now', ?)
+                ''', params).fetchone()[0]
+                # Numeric columns first and timestamp last, so each chunk
+                # drops straight into the preallocated arrays; LIMIT keeps
+                # rows written after the count from overflowing them
+                cursor = conn.execute(f'''
+                    SELECT id, pump_id, sensor_id, {', '.join(SENSOR_COLUMNS)}, timestamp
+                    FROM sensor_data 
                     WHERE pump_id = ? AND timestamp >= datetime('now', ?)
                     ORDER BY timestamp ASC
-                '''
-                return pd.read_sql(query, conn, params=(pump_id, f'-{hours} hours'))
+                    LIMIT ?
+                ''', params + (count,))
+                values = np.empty((count, 3 + len(SENSOR_COLUMNS)), dtype=np.float64)
+                timestamps = np.empty(count, dtype='datetime64[s]')
+                filled = 0
+                while chunk := cursor.fetchmany(_FETCH_CHUNK):
+                    end = filled + len(chunk)
+                    # NULL readings become NaN
+                    values[filled:end] = [row[:-1] for row in chunk]
+                    timestamps[filled:end] = [row[-1] for row in chunk]
+                    filled = end
+                values = values[:filled]
+                columns = {
+                    'id': values[:, 0].astype(np.int64),
+                    'pump_id': values[:, 1].astype(np.int64),
+                    'sensor_id': values[:, 2],
+                    'timestamp': timestamps[:filled]
+                }
+                for offset, column in enumerate(SENSOR_COLUMNS, start=3):
+                    columns[column] = values[:, offset]
+                return pd.DataFrame(columns, copy=False)
         except Exception as e:
             self.logger.error(f"Sensor data history retrieval error: {e}")
             return pd.DataFrame()
@@ -577,7 +741,7 @@ class DatabaseManager:
     def save_prediction(self, pump_id: int, prediction_data: Dict[str, Any]):
         """Save prediction results."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute('''
                     INSERT INTO predictions 
                     (pump_id, failure_probability, predicted_failure_type, 
@@ -598,7 +762,7 @@ class DatabaseManager:
     def get_predictions(self, pump_id: int = None, days: int = 30) -> pd.DataFrame:
         """Retrieve predictions."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 if pump_id:
                     query = '''
                         SELECT p.*, pump.name as pump_name 
@@ -625,7 +789,7 @@ class DatabaseManager:
     def create_alert(self, pump_id: int, alert_type: str, severity: str, message: str):
         """Create a new alert."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute('''
                     INSERT INTO alerts (pump_id, alert_type, severity, message)
                     VALUES (?, ?, ?, ?)
@@ -643,7 +807,7 @@ class DatabaseManager:
     def get_active_alerts(self) -> pd.DataFrame:
         """Retrieve active alerts."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 return pd.read_sql('''
                     SELECT a.*, p.name as pump_name, p.location
                     FROM alerts a 
@@ -658,7 +822,7 @@ class DatabaseManager:
     def resolve_alert(self, alert_id: int, resolved_by: str = "System"):
         """Resolve an alert."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute('''
                     UPDATE alerts 
                     SET resolved = TRUE, resolved_at = CURRENT_TIMESTAMP, resolved_by = ?
@@ -672,7 +836,7 @@ class DatabaseManager:
     def schedule_maintenance(self, maintenance_data: Dict[str, Any]) -> int:
         """Schedule maintenance."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.execute('''
                     INSERT INTO maintenance 
                     (pump_id, scheduled_date, maintenance_type, description, technician, cost)
@@ -703,7 +867,7 @@ class DatabaseManager:
     def get_maintenance_schedule(self, pump_id: int = None) -> pd.DataFrame:
         """Retrieve the maintenance schedule."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 if pump_id:
                     query = '''
                         SELECT m.*, p.name as pump_name 
@@ -729,7 +893,7 @@ class DatabaseManager:
     def get_operation_logs(self, days: int = 7) -> pd.DataFrame:
         """Retrieve the operation log."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 return pd.read_sql('''
                     SELECT l.*, p.name as pump_name 
                     FROM operation_logs l
@@ -744,7 +908,7 @@ class DatabaseManager:
     def get_system_stats(self) -> Dict[str, Any]:
         """Retrieve system statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 stats = {}
                 
                 # Total pumps
@@ -778,11 +942,27 @@ class DatabaseManager:
             return {}
     
     # Database utilities
+    def close(self):
+        """Write pending sensor readings and close the shared connection."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self.flush_sensor_data()
+            # Refresh planner statistics for the indexes when they have drifted
+            self._conn.execute('PRAGMA optimize')
+            self._conn.close()
+    
     def backup_database(self, backup_path: Path) -> bool:
         """Create a database backup."""
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # Online backup includes pages still held in the WAL file
+            target = sqlite3.connect(backup_path)
+            try:
+                with self._lock:
+                    self.flush_sensor_data()
+                    self._conn.backup(target)
+            finally:
+                target.close()
             self.logger.info(f"Created backup at: {backup_path}")
             return True
         except Exception as e:
@@ -792,7 +972,7 @@ class DatabaseManager:
     def optimize_database(self):
         """Optimize database performance."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute("VACUUM")
                 conn.execute("ANALYZE")
                 self.logger.info("Database optimized")
@@ -802,7 +982,7 @@ class DatabaseManager:
     def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 # Remove old sensor data
                 conn.execute('''
                     DELETE FROM sensor_data 
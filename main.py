@@ -11,11 +11,11 @@ import sys
 import os
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QFont, QIcon
-from PyQt6.QtCore import QTimer, Qt, QSize
 import qdarkstyle
 
 from ui.main_window import MainWindow
 from utils.logger import setup_logger
+from ai_models import failure_predictor
 from config import APP_CONFIG
 
 class iPumpApp:
@@ -44,6 +44,8 @@ class iPumpApp:
     def run(self):
         """Start the Qt event loop."""
         self.main_window.show()
+        # Load the failure model in the background once the window is up
+        failure_predictor.warm_up()
         return self.app.exec()
 
 def main():
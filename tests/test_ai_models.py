@@ -0,0 +1,69 @@
+"""
+Tests for the failure predictor's single-reading prediction cache.
+"""
+
+import numpy as np
+import pytest
+
+from ai_models import AdvancedFailurePredictor
+
+NORMAL_READING = {
+    'vibration_x': 1.0, 'vibration_y': 1.0, 'vibration_z': 1.0,
+    'temperature': 60.0, 'pressure': 5.0, 'flow_rate': 100.0,
+    'power_consumption': 50.0, 'operating_hours': 1000.0,
+    'bearing_temperature': 50.0, 'oil_level': 0.8, 'oil_quality': 0.9
+}
+
+
+class _FixedMarginBooster:
+    """Stands in for the booster; every row gets the same margin"""
+
+    def inplace_predict(self, X, predict_type='margin'):
+        return np.full(len(X), -3.0, dtype=np.float32)
+
+
+@pytest.fixture
+def make_predictor(monkeypatch):
+    """Predictor that skips model loading and scores every row with a fixed margin"""
+    monkeypatch.setattr(AdvancedFailurePredictor, 'load_model', lambda self: False)
+
+    def make():
+        predictor = AdvancedFailurePredictor()
+        predictor.preprocessor.transform_row = lambda X: X
+        predictor._single_booster = _FixedMarginBooster()
+        predictor._compiled = None
+        predictor.is_trained = True
+        return predictor
+    return make
+
+
+def _without_timestamp(result):
+    return {key: value for key, value in result.items() if key != 'timestamp_ns'}
+
+
+@pytest.mark.parametrize('first, second', [
+    # Both pairs round to the same cache key but sit on either side of a rule threshold
+    ({'oil_level': 0.201}, {'oil_level': 0.199}),
+    ({'temperature': 79.996}, {'temperature': 80.004}),
+    # Non-feature keys feed the confidence, not the cache key
+    ({}, {'status': 0, 'alarm_count': 0, 'fault_code': 0, 'trip_count': 0}),
+])
+def test_cached_margin_keeps_rules_exact(make_predictor, first, second):
+    predictor = make_predictor()
+    predictor.predict_failure({**NORMAL_READING, **first})
+    result = predictor.predict_failure({**NORMAL_READING, **second})
+    assert predictor.cache_hits == 1
+
+    fresh = make_predictor().predict_failure({**NORMAL_READING, **second})
+    assert _without_timestamp(result) == _without_timestamp(fresh)
+    # The pair must actually produce different results for the test to mean anything
+    fresh_first = make_predictor().predict_failure({**NORMAL_READING, **first})
+    assert _without_timestamp(fresh_first) != _without_timestamp(fresh)
+
+
+def test_low_oil_after_cached_neighbour_is_flagged(make_predictor):
+    predictor = make_predictor()
+    predictor.predict_failure({**NORMAL_READING, 'oil_level': 0.201})
+    result = predictor.predict_failure({**NORMAL_READING, 'oil_level': 0.199})
+    assert any('oil' in text.lower() for text in result['recommendations'])
+    assert result['predicted_failure_type'] != 'Normal'
@@ -243,36 +243,44 @@ class AnalyticsTab(QWidget):
             freq='H'
         )
         
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         n_points = len(dates)
-        
-        self.historical_data = pd.DataFrame({
-            'timestamp': dates,
-            'vibration_x': np.random.normal(2.5, 1.0, n_points) + 
-                          np.sin(np.arange(n_points) * 0.1) * 0.5,
-            'vibration_y': np.random.normal(2.8, 1.2, n_points) + 
-                          np.sin(np.arange(n_points) * 0.1) * 0.6,
-            'vibration_z': np.random.normal(2.2, 0.8, n_points) + 
-                          np.sin(np.arange(n_points) * 0.1) * 0.4,
-            'temperature': np.random.normal(70, 8, n_points) + 
-                          np.arange(n_points) * 0.01,
-            'pressure': np.random.normal(150, 15, n_points),
-            'flow_rate': np.random.normal(100, 12, n_points),
-            'power_consumption': np.random.normal(80, 10, n_points),
-            'oil_level': np.random.uniform(0.6, 1.0, n_points) - 
-                        np.arange(n_points) * 0.0001,
-            'oil_quality': np.random.uniform(0.7, 1.0, n_points) - 
-                          np.arange(n_points) * 0.00005
-        })
+        steps = np.arange(n_points, dtype=np.float32)
+        
+        # One column-major block, each column filled in place
+        columns = ['vibration_x', 'vibration_y', 'vibration_z', 'temperature', 'pressure',
+                   'flow_rate', 'power_consumption', 'oil_level', 'oil_quality']
+        values = np.empty((n_points, len(columns)), dtype=np.float32, order='F')
+        
+        # Normal readings: (mean, std)
+        for i, (mean, std) in enumerate([(2.5, 1.0), (2.8, 1.2), (2.2, 0.8), (70, 8),
+                                         (150, 15), (100, 12), (80, 10)]):
+            column = values[:, i]
+            rng.standard_normal(n_points, dtype=np.float32, out=column)
+            column *= std
+            column += mean
+        
+        # Oil readings: uniform(low, high) with a slow decline
+        for i, (low, high, decline) in enumerate([(0.6, 1.0, 0.0001), (0.7, 1.0, 0.00005)], start=7):
+            column = values[:, i]
+            rng.random(n_points, dtype=np.float32, out=column)
+            column *= high - low
+            column += low
+            column -= steps * decline
+        
+        # Periodic vibration and a rising temperature trend
+        values[:, :3] += np.sin(steps * 0.1)[:, None] * np.array([0.5, 0.6, 0.4], dtype=np.float32)
+        values[:, 3] += steps * 0.01
         
         # Inject a few anomalies
         n_anomalies = n_points // 50
-        anomaly_indices = np.random.choice(n_points, n_anomalies, replace=False)
+        anomaly_indices = rng.choice(n_points, n_anomalies, replace=False)
+        anomaly_indices = anomaly_indices[rng.random(n_anomalies) > 0.5]
+        values[anomaly_indices, 3] += rng.normal(20, 5, len(anomaly_indices))
+        values[anomaly_indices, 0] += rng.normal(3, 1, len(anomaly_indices))
         
-        for idx in anomaly_indices:
-            if np.random.random() > 0.5:
-                self.historical_data.loc[idx, 'temperature'] += np.random.normal(20, 5)
-                self.historical_data.loc[idx, 'vibration_x'] += np.random.normal(3, 1)
+        self.historical_data = pd.DataFrame(values, columns=columns, copy=False)
+        self.historical_data.insert(0, 'timestamp', dates)
     
     def update_time_plot(self):
         """Update the time-series plot."""
@@ -423,11 +431,8 @@ class AnalyticsTab(QWidget):
         self.failure_trend_plot.clear()
         
         # Simulate failure probabilities over time
-        failure_probs = []
-        for _, row in self.historical_data.iterrows():
-            sensor_data = row.to_dict()
-            prediction = failure_predictor.predict_failure(sensor_data)
-            failure_probs.append(prediction['failure_probability'])
+        predictions = failure_predictor.predict_failure_batch(self.historical_data)
+        failure_probs = predictions['failure_probability'].to_numpy()
         
         # Plot failure probability trend
         self.failure_trend_plot.plot(self.historical_data['timestamp'], failure_probs,
@@ -21,6 +21,7 @@ class DashboardTab(QWidget):
         super().__init__()
         self.selected_pump_id = 1
         self.sensor_data = []
+        self._rng = np.random.default_rng()
         self.setup_ui()
         self.load_pump_data()
         
@@ -405,11 +406,8 @@ class DashboardTab(QWidget):
         # Update vibration data
         if 'Vibrations' in self.charts:
             time_data = np.linspace(0, 10, 50)
-            vib_data = [
-                sensor_data['vibration_x'] + np.random.normal(0, 0.2, 50),
-                sensor_data['vibration_y'] + np.random.normal(0, 0.2, 50),
-                sensor_data['vibration_z'] + np.random.normal(0, 0.2, 50)
-            ]
+            vib_data = self._rng.normal(0, 0.2, (3, 50))
+            vib_data += [[sensor_data['vibration_x']], [sensor_data['vibration_y']], [sensor_data['vibration_z']]]
             
             for i, curve in enumerate(self.charts['Vibrations']):
                 curve.setData(time_data, vib_data[i])
@@ -417,10 +415,8 @@ class DashboardTab(QWidget):
         # Update temperature and pressure data
         if 'Temperature and Pressure' in self.charts:
             time_data = np.linspace(0, 10, 50)
-            temp_pressure_data = [
-                sensor_data['temperature'] + np.random.normal(0, 1, 50),
-                sensor_data['pressure'] + np.random.normal(0, 2, 50)
-            ]
+            temp_pressure_data = self._rng.normal(0, [[1], [2]], (2, 50))
+            temp_pressure_data += [[sensor_data['temperature']], [sensor_data['pressure']]]
             
             for i, curve in enumerate(self.charts['Temperature and Pressure']):
                 curve.setData(time_data, temp_pressure_data[i])
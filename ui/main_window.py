@@ -626,11 +626,8 @@ class MainWindow(QMainWindow):
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.start_background_update)
         
-        # Set minimum refresh interval
-        refresh_interval = UI_CONFIG.get('refresh_interval', 30000)
-        if refresh_interval < 1000:
-            refresh_interval = 1000
-        self.update_timer.start(refresh_interval)
+        # Minimum of 1000 ms is enforced when config is imported
+        self.update_timer.start(UI_CONFIG['refresh_interval'])
 
         self.slow_update_timer = QTimer()
         self.slow_update_timer.timeout.connect(self.slow_update)
@@ -1111,9 +1108,9 @@ class MainWindow(QMainWindow):
     def apply_window_size(self, width: int, height: int):
         """Apply window size ensuring limits from config"""
         try:
-            win_conf = UI_CONFIG.get('window', {})
-            min_w, min_h = win_conf.get('min_size', (640, 480))
-            max_w, max_h = win_conf.get('max_size', (3840, 2160))
+            window = UI_CONFIG['window']
+            min_w, min_h = window.min_size
+            max_w, max_h = window.max_size
             w = max(min_w, min(width, max_w))
             h = max(min_h, min(height, max_h))
             self.resize(w, h)
@@ -1125,7 +1122,7 @@ class MainWindow(QMainWindow):
     def set_window_size_preset(self, preset_name: str):
         """Set window size based on preset name"""
         try:
-            presets = UI_CONFIG.get('window', {}).get('presets', {})
+            presets = UI_CONFIG['window'].presets
             if preset_name in presets:
                 w, h = presets[preset_name]
                 self.apply_window_size(int(w), int(h))
@@ -1155,6 +1152,7 @@ class MainWindow(QMainWindow):
             self.slow_update_timer.stop()
             self.time_timer.stop()
             self.memory_timer.stop()
+            db_manager.close()
             event.accept()
         else:
             event.ignore()
@@ -1426,11 +1424,12 @@ class CustomSizeDialog(QDialog):
     
         self.width_spin = QSpinBox()
         self.width_spin.setRange(320, 7680)
-        self.width_spin.setValue(UI_CONFIG.get('window', {}).get('default_size', (1200,800))[0])
+        default_w, default_h = UI_CONFIG['window'].default_size
+        self.width_spin.setValue(default_w)
     
         self.height_spin = QSpinBox()
         self.height_spin.setRange(240, 4320)
-        self.height_spin.setValue(UI_CONFIG.get('window', {}).get('default_size', (1200,800))[1])
+        self.height_spin.setValue(default_h)
     
         layout.addRow("Width (px):", self.width_spin)
         layout.addRow("Height (px):", self.height_spin)
@@ -33,23 +33,37 @@ def safe_divide(numerator: float, denominator: float) -> float:
     """Perform a safe division (avoid division by zero)."""
     return numerator / denominator if denominator != 0 else 0
 
+# Sample sensor distributions: normal (mean, std) then uniform (low, high)
+_SAMPLE_NORMAL = {
+    'vibration_x': (2.5, 0.8),
+    'vibration_y': (2.8, 0.9),
+    'vibration_z': (2.2, 0.7),
+    'temperature': (70, 10),
+    'pressure': (150, 20),
+    'flow_rate': (100, 15),
+    'power_consumption': (80, 12),
+    'bearing_temperature': (72, 8)
+}
+_SAMPLE_UNIFORM = {
+    'oil_level': (0.6, 1.0),
+    'oil_quality': (0.7, 0.95),
+    'operating_hours': (1000, 4000)
+}
+_SAMPLE_FIELDS = [*_SAMPLE_NORMAL, *_SAMPLE_UNIFORM]
+_SAMPLE_NORMAL_PARAMS = np.array(list(_SAMPLE_NORMAL.values()), dtype=float).T
+_SAMPLE_UNIFORM_PARAMS = np.array(list(_SAMPLE_UNIFORM.values()), dtype=float).T
+
 def generate_sample_sensor_data(pump_id: int) -> Dict[str, float]:
     """Generate deterministic sample sensor data."""
-    np.random.seed(pump_id)
+    # A generator per pump, leaving NumPy's global random state untouched
+    rng = np.random.default_rng(pump_id)
     
-    return {
-        'vibration_x': np.random.normal(2.5, 0.8),
-        'vibration_y': np.random.normal(2.8, 0.9),
-        'vibration_z': np.random.normal(2.2, 0.7),
-        'temperature': np.random.normal(70, 10),
-        'pressure': np.random.normal(150, 20),
-        'flow_rate': np.random.normal(100, 15),
-        'power_consumption': np.random.normal(80, 12),
-        'bearing_temperature': np.random.normal(72, 8),
-        'oil_level': np.random.uniform(0.6, 1.0),
-        'oil_quality': np.random.uniform(0.7, 0.95),
-        'operating_hours': np.random.uniform(1000, 4000)
-    }
+    # One draw per distribution family
+    values = np.concatenate([
+        rng.normal(*_SAMPLE_NORMAL_PARAMS),
+        rng.uniform(*_SAMPLE_UNIFORM_PARAMS)
+    ])
+    return dict(zip(_SAMPLE_FIELDS, values.tolist()))
 
 def validate_sensor_data(data: Dict[str, float]) -> bool:
     """Validate incoming sensor data."""